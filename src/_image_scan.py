@@ -0,0 +1,120 @@
+"""
+Shared helpers for the image zipping scripts: a single-pass directory scanner and
+a thread-pool reader that prepares zip entries for a single ZipFile writer.
+"""
+
+import os
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+# Common image extensions, as a tuple so str.endswith can test them in one call
+IMAGE_SUFFIXES = ('.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.webp')
+
+# Formats that are already compressed; deflating them costs CPU for no gain
+COMPRESSED_SUFFIXES = ('.jpg', '.jpeg', '.png', '.webp', '.gif')
+
+# Number of threads reading image files ahead of the zip writer
+READ_WORKERS = 8
+
+# Read-ahead hints are only available on Linux and some other POSIX systems
+HAS_FADVISE = hasattr(os, 'posix_fadvise')
+
+def iter_image_entries(images_dir, limit=None, suffixes=IMAGE_SUFFIXES):
+    """
+    Lazily yield os.DirEntry objects for image files from a single directory scan.
+    Extensions are matched case-insensitively, so each file is seen exactly once.
+    Hidden files such as AppleDouble "._name.jpg" companions are skipped, as glob does.
+    Entries cache their stat result, so callers that call entry.stat() only on the
+    files they keep stat each of them at most once.
+    
+    Args:
+        images_dir (str): Path to the images directory
+        limit (int): Stop after this many images (None scans the whole directory)
+        suffixes (tuple): Lowercase file name suffixes to match
+    """
+    if limit is not None and limit <= 0:
+        return
+    count = 0
+    with os.scandir(images_dir) as entries:
+        for entry in entries:
+            if entry.name.startswith('.'):
+                continue
+            if entry.name.lower().endswith(suffixes) and entry.is_file():
+                yield entry
+                count += 1
+                if count == limit:
+                    return
+
+def compress_type_for(image_path):
+    """
+    Pick the zip compression method for an image file.
+    
+    Args:
+        image_path (str): Path to the image file
+    """
+    if image_path.lower().endswith(COMPRESSED_SUFFIXES):
+        return zipfile.ZIP_STORED
+    return zipfile.ZIP_DEFLATED
+
+def advise_sequential_read(fd):
+    """
+    Ask the kernel to read a whole file ahead, since it is about to be read in full.
+    
+    Args:
+        fd (int): Open file descriptor
+    """
+    if not HAS_FADVISE:
+        return
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+    except OSError:
+        # Hints are best effort; some filesystems reject them
+        pass
+
+def read_image(image_path, st):
+    """
+    Read an image file and build its zip entry, keeping the file's timestamp and mode.
+    
+    Args:
+        image_path (str): Path to the image file
+        st (os.stat_result): Stat result cached from the directory scan
+        
+    Returns:
+        tuple: (ZipInfo, bytes) ready for ZipFile.writestr
+    """
+    # Same fields as ZipInfo.from_file, without stat'ing the file again
+    zinfo = zipfile.ZipInfo(os.path.basename(image_path), time.localtime(st.st_mtime)[0:6])
+    zinfo.external_attr = (st.st_mode & 0xFFFF) << 16
+    zinfo.compress_type = compress_type_for(image_path)
+    with open(image_path, 'rb') as f:
+        advise_sequential_read(f.fileno())
+        # Size the read from the scan instead of stat'ing the file again; ask
+        # for one byte more so a file that grew since the scan is noticed
+        data = f.read(st.st_size + 1)
+        if len(data) != st.st_size:
+            # The file changed after the scan: read whatever is there now
+            data += f.read()
+    zinfo.file_size = len(data)
+    return zinfo, data
+
+def iter_image_data(images, max_workers=READ_WORKERS):
+    """
+    Read image files on a thread pool and yield them in their original order.
+    Only the reads run in parallel; the caller writes to the ZipFile from a single
+    thread. At most 2 * max_workers files are buffered at a time.
+    
+    Args:
+        images: Iterable of (image path, stat result) pairs
+        max_workers (int): Number of reader threads
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        pending = deque()
+        for image_path, st in images:
+            pending.append(pool.submit(read_image, image_path, st))
+            if len(pending) >= 2 * max_workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
@@ -11,17 +11,24 @@ Author: Dataset Extraction Tool
 Date: 2024
 """
 
+import io
 import os
 import pandas as pd
-import glob
 from pathlib import Path
 from tqdm import tqdm
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Iterator, NamedTuple, Optional, Set, Tuple, Union
 import argparse
 import sys
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from PIL import Image
-import hashlib
+import xxhash
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
 
 # Configure logging
 logging.basicConfig(
@@ -35,12 +42,38 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def _write_bytes(path: str, data: bytes) -> None:
+    """
+    Write raw image bytes to a file.
+    """
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+class _PendingImage(NamedTuple):
+    """
+    An image hashed (and encoded) on a conversion thread, still waiting for its file name.
+    """
+    image_hash: Any
+    data: bytes
+
+
+class _PendingBatch(NamedTuple):
+    """
+    A record batch submitted to the conversion pool, in dataset order.
+    """
+    parquet_file: Path
+    start_index: int
+    future: Future
+    nbytes: int
+
+
 class DatasetExtractor:
     """
     A class to extract data from Hugging Face datasets stored in parquet format.
     """
     
-    def __init__(self, data_directory: str, output_file: str = "extracted_dataset.csv", save_images: bool = False, images_dir: str = "images"):
+    def __init__(self, data_directory: str, output_file: str = "extracted_dataset.csv", save_images: bool = False, images_dir: str = "images", max_workers: Optional[int] = None, batch_size: int = 32768, max_inflight_bytes: int = 32 << 20):
         """
         Initialize the DatasetExtractor.
         
@@ -49,13 +82,38 @@ class DatasetExtractor:
             output_file (str): Name of the output CSV file
             save_images (bool): Whether to save images locally
             images_dir (str): Directory to save images
+            max_workers (Optional[int]): Number of record batches converted in parallel
+                (defaults to the number of CPUs)
+            batch_size (int): Maximum number of records read from a parquet file at a time
+            max_inflight_bytes (int): Approximate size of the record batches being
+                converted at once; batches of wide rows hold fewer records
         """
         self.data_directory = Path(data_directory)
         self.output_file = output_file
         self.save_images = save_images
         self.images_dir = Path(images_dir)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.max_inflight_bytes = max_inflight_bytes
         self.parquet_files = []
-        self.extracted_data = []
+        self._total_records = 0
+        self._columns: List[str] = []
+        self._sample: Optional[pd.DataFrame] = None
+        self._nbytes = 0
+        self._output_size = 0
+        self._metadata: Dict[Path, pq.FileMetaData] = {}
+        self._writer_pool: Optional[ThreadPoolExecutor] = None
+        self._pending_writes: Set[Future] = set()
+        self._pending_lock = threading.Lock()
+        self._write_slots = threading.BoundedSemaphore(64)
+        self._seen_hashes: Dict[int, str] = {}
+        self._seen_lock = threading.Lock()
+        
+        # Size Arrow's I/O pool for concurrent reads (override with EXTRACT_IO_THREADS);
+        # these are process-wide settings
+        cpu_count = os.cpu_count() or 4
+        pa.set_io_thread_count(int(os.environ.get("EXTRACT_IO_THREADS", min(16, cpu_count * 2))))
+        pa.set_cpu_count(cpu_count)
         
         # Validate data directory
         if not self.data_directory.exists():
@@ -64,6 +122,7 @@ class DatasetExtractor:
         # Create images directory if saving images
         if self.save_images:
             self.images_dir.mkdir(exist_ok=True)
+            self._writer_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="image-writer")
             logger.info(f"Images will be saved to: {self.images_dir}")
     
     def find_parquet_files(self) -> List[Path]:
@@ -73,23 +132,221 @@ class DatasetExtractor:
         Returns:
             List[Path]: List of parquet file paths
         """
-        pattern = str(self.data_directory / "*.parquet")
-        parquet_files = glob.glob(pattern)
+        with os.scandir(self.data_directory) as entries:
+            parquet_files = [
+                Path(entry.path) for entry in entries
+                if entry.name.endswith(".parquet") and entry.is_file()
+            ]
         
         if not parquet_files:
             raise FileNotFoundError(f"No parquet files found in {self.data_directory}")
         
         # Sort files for consistent processing order
         parquet_files.sort()
-        self.parquet_files = [Path(f) for f in parquet_files]
+        self.parquet_files = parquet_files
         
         logger.info(f"Found {len(self.parquet_files)} parquet files")
         return self.parquet_files
     
+    def _write_image(self, image_path: str, write: Callable[..., Any], *args: Any, **kwargs: Any) -> None:
+        """
+        Run a queued image write on a writer thread, logging the outcome.
+        
+        Args:
+            image_path (str): Destination of the image
+            write: Callable that writes the image
+        """
+        try:
+            write(*args, **kwargs)
+            logger.debug(f"Saved image: {image_path}")
+        except Exception as e:
+            logger.error(f"Error saving image {image_path}: {str(e)}")
+    
+    def _write_done(self, future: Future) -> None:
+        """
+        Release the slot held by a finished image write.
+        """
+        with self._pending_lock:
+            self._pending_writes.discard(future)
+        self._write_slots.release()
+    
+    def _submit_image_write(self, image_path: str, write: Callable[..., Any], *args: Any, **kwargs: Any) -> None:
+        """
+        Queue an image write on the writer pool so disk latency overlaps with
+        parquet decoding. Blocks when too many writes are already pending.
+        
+        Args:
+            image_path (str): Destination of the image
+            write: Callable that writes the image, called with the remaining arguments
+        """
+        self._write_slots.acquire()
+        future = self._writer_pool.submit(self._write_image, image_path, write, *args, **kwargs)
+        with self._pending_lock:
+            self._pending_writes.add(future)
+        future.add_done_callback(self._write_done)
+    
+    def flush_images(self) -> None:
+        """
+        Wait until all queued image writes have reached the disk.
+        """
+        with self._pending_lock:
+            pending = list(self._pending_writes)
+        wait(pending)
+    
+    def _claim_image_path(self, image_hash: Any, record_index: int) -> Tuple[str, bool]:
+        """
+        Name the file for an image, reusing the path of an identical image seen before.
+        
+        Args:
+            image_hash: xxh3_64 hash of the image content
+            record_index: Index of the current record for unique naming
+            
+        Returns:
+            Tuple[str, bool]: Image path and whether the image still has to be written
+        """
+        # Key on the full 64-bit digest; the 8-char tag in the name would collide
+        key = image_hash.intdigest()
+        with self._seen_lock:
+            cached = self._seen_hashes.get(key)
+            if cached is not None:
+                return cached, False
+            
+            # Generate unique filename based on record index and image hash
+            filename = f"image_{record_index:06d}_{image_hash.hexdigest()[:8]}.png"
+            image_path = str(self.images_dir / filename)
+            self._seen_hashes[key] = image_path
+            return image_path, True
+    
+    def _prepare_image_bytes(self, image_bytes: Optional[bytes], record_index: int) -> Union[str, "_PendingImage"]:
+        """
+        Hash already encoded image bytes, as stored by Hugging Face datasets.
+        
+        Args:
+            image_bytes: Encoded image, or None if the record has no image
+            record_index: Index of the current record, for error messages
+            
+        Returns:
+            Union[str, _PendingImage]: Image waiting for a file name, or "No image"
+            / error information
+        """
+        if image_bytes is None:
+            return "No image"
+        
+        try:
+            return _PendingImage(xxhash.xxh3_64(image_bytes), image_bytes)
+            
+        except Exception as e:
+            logger.error(f"Error saving image for record {record_index}: {str(e)}")
+            return f"Error saving image: {str(e)}"
+    
+    def _prepare_image(self, image_data: Any, record_index: int) -> Union[str, "_PendingImage"]:
+        """
+        Hash and, if needed, encode an image without naming its file yet, so this
+        can run on any thread.
+        
+        Args:
+            image_data: Image data from the dataset
+            record_index: Index of the current record, for error messages
+            
+        Returns:
+            Union[str, _PendingImage]: Image waiting for a file name, or the final
+            value for records that have nothing to save
+        """
+        if image_data is None:
+            return "No image"
+        
+        try:
+            # Handle PIL Image objects
+            if hasattr(image_data, 'save'):
+                # Hash the encoded source file when there is one rather than
+                # copying the decoded pixels out with tobytes(). The file only
+                # matches the pixels while the image is untouched: Pillow closes
+                # fp once the image is loaded, which in-place edits such as
+                # thumbnail() or paste() do first
+                source_file = getattr(image_data, 'filename', None)
+                untouched = getattr(image_data, 'fp', None) is not None
+                source_bytes = (Path(source_file).read_bytes()
+                                if untouched and source_file and os.path.isfile(source_file) else None)
+                image_hash = xxhash.xxh3_64(source_bytes if source_bytes is not None else image_data.tobytes())
+                
+                # Skip encoding an image that has already been saved; that path
+                # was named after an earlier record, as _resolve_image would do
+                with self._seen_lock:
+                    cached = self._seen_hashes.get(image_hash.intdigest())
+                if cached is not None:
+                    return cached
+                
+                # Write the original bytes if the source is already a PNG, otherwise
+                # encode with fast compression (Pillow defaults to level 6). Encoding
+                # happens here rather than on a writer thread, as the caller may
+                # close or change the image as soon as this returns
+                if source_bytes is not None and getattr(image_data, 'format', None) == 'PNG':
+                    return _PendingImage(image_hash, source_bytes)
+                buffer = io.BytesIO()
+                image_data.save(buffer, format='PNG', compress_level=1)
+                return _PendingImage(image_hash, buffer.getvalue())
+            
+            # Handle Hugging Face Image format (dictionary with 'bytes' key)
+            elif isinstance(image_data, dict) and 'bytes' in image_data:
+                return self._prepare_image_bytes(image_data['bytes'], record_index)
+            
+            # Handle image data as bytes
+            elif isinstance(image_data, bytes):
+                return self._prepare_image_bytes(image_data, record_index)
+            
+            # Handle string paths (if image is already a file path)
+            elif isinstance(image_data, str):
+                # If it's already a local path, return it
+                if os.path.exists(image_data):
+                    return image_data
+                else:
+                    # If it's a URL or remote path, we can't save it without downloading
+                    logger.warning(f"Cannot save remote image: {image_data}")
+                    return f"Remote image: {image_data}"
+            
+            else:
+                logger.warning(f"Unknown image data type: {type(image_data)}")
+                return f"Unknown image type: {type(image_data)}"
+                
+        except Exception as e:
+            logger.error(f"Error saving image for record {record_index}: {str(e)}")
+            return f"Error saving image: {str(e)}"
+    
+    def _resolve_image(self, prepared: Union[str, "_PendingImage"], record_index: int) -> str:
+        """
+        Name the file for a prepared image and queue its write.
+        
+        Extraction calls this in record order on a single thread, so identical
+        images are always named after the first record they appear in.
+        
+        Args:
+            prepared: Result of _prepare_image or _prepare_image_bytes
+            record_index: Index of the current record for unique naming
+            
+        Returns:
+            str: Local image path or error information
+        """
+        if not isinstance(prepared, _PendingImage):
+            return prepared
+        
+        try:
+            image_path, is_new = self._claim_image_path(prepared.image_hash, record_index)
+            
+            # Save bytes as image
+            if is_new:
+                self._submit_image_write(image_path, _write_bytes, image_path, prepared.data)
+            return image_path
+            
+        except Exception as e:
+            logger.error(f"Error saving image for record {record_index}: {str(e)}")
+            return f"Error saving image: {str(e)}"
+    
     def process_image_field(self, image_data: Any, record_index: int = 0) -> str:
         """
-        Process image field data. If save_images is True, saves the image locally
-        and returns the local path. Otherwise, returns metadata about the image.
+        Process image field data. If save_images is True, queues the image to be
+        saved locally and returns the local path (call flush_images() before
+        reading the files). Identical images are only saved once and share a path.
+        Otherwise, returns metadata about the image.
         
         Args:
             image_data: Image data from the dataset
@@ -103,61 +360,7 @@ class DatasetExtractor:
         
         # If saving images is enabled
         if self.save_images:
-            try:
-                # Handle PIL Image objects
-                if hasattr(image_data, 'save'):
-                    # Generate unique filename based on record index and image hash
-                    image_hash = hashlib.md5(str(image_data.tobytes()).encode()).hexdigest()[:8]
-                    filename = f"image_{record_index:06d}_{image_hash}.png"
-                    image_path = self.images_dir / filename
-                    
-                    # Save the image
-                    image_data.save(image_path, format='PNG')
-                    logger.debug(f"Saved image: {image_path}")
-                    return str(image_path)
-                
-                # Handle Hugging Face Image format (dictionary with 'bytes' key)
-                elif isinstance(image_data, dict) and 'bytes' in image_data:
-                    image_bytes = image_data['bytes']
-                    image_hash = hashlib.md5(image_bytes).hexdigest()[:8]
-                    filename = f"image_{record_index:06d}_{image_hash}.png"
-                    image_path = self.images_dir / filename
-                    
-                    # Save bytes as image
-                    with open(image_path, 'wb') as f:
-                        f.write(image_bytes)
-                    logger.debug(f"Saved image from HF format: {image_path}")
-                    return str(image_path)
-                
-                # Handle image data as bytes
-                elif isinstance(image_data, bytes):
-                    image_hash = hashlib.md5(image_data).hexdigest()[:8]
-                    filename = f"image_{record_index:06d}_{image_hash}.png"
-                    image_path = self.images_dir / filename
-                    
-                    # Save bytes as image
-                    with open(image_path, 'wb') as f:
-                        f.write(image_data)
-                    logger.debug(f"Saved image from bytes: {image_path}")
-                    return str(image_path)
-                
-                # Handle string paths (if image is already a file path)
-                elif isinstance(image_data, str):
-                    # If it's already a local path, return it
-                    if os.path.exists(image_data):
-                        return image_data
-                    else:
-                        # If it's a URL or remote path, we can't save it without downloading
-                        logger.warning(f"Cannot save remote image: {image_data}")
-                        return f"Remote image: {image_data}"
-                
-                else:
-                    logger.warning(f"Unknown image data type: {type(image_data)}")
-                    return f"Unknown image type: {type(image_data)}"
-                    
-            except Exception as e:
-                logger.error(f"Error saving image for record {record_index}: {str(e)}")
-                return f"Error saving image: {str(e)}"
+            return self._resolve_image(self._prepare_image(image_data, record_index), record_index)
         
         else:
             # If not saving images, return metadata
@@ -168,91 +371,427 @@ class DatasetExtractor:
             else:
                 return "Image data present"
     
-    def extract_data_from_parquet(self, parquet_file: Path) -> List[Dict[str, Any]]:
+    def _project_columns(self, schema: pa.Schema) -> List[str]:
         """
-        Extract data from a single parquet file.
+        Choose the columns to read from a parquet file.
+        
+        When images are not being saved, only a small leaf of the HF image struct
+        is read: its definition levels still tell rows with and without an image
+        apart, so the image bytes never leave the disk.
         
         Args:
-            parquet_file (Path): Path to the parquet file
+            schema (pa.Schema): Arrow schema of the parquet file
             
         Returns:
-            List[Dict[str, Any]]: List of extracted records
+            List[str]: Column paths to read
         """
-        try:
-            # Read parquet file
-            df = pd.read_parquet(parquet_file)
-            logger.info(f"Processing {parquet_file.name}: {len(df)} records")
+        columns = []
+        for field in schema:
+            if field.name == 'image' and not self.save_images and pa.types.is_struct(field.type):
+                leaves = [child.name for child in field.type if child.name != 'bytes']
+                if leaves:
+                    columns.append(f"image.{leaves[0]}")
+                    continue
+            columns.append(field.name)
+        return columns
+    
+    def _plan(self) -> None:
+        """
+        Read every parquet footer once, before any data is decoded.
+        
+        The footers give the CSV header (all columns, in first-seen order) and
+        the row group layout; they are reused when the files are read so no
+        footer is parsed twice. Files whose footer cannot be read are skipped.
+        """
+        self._metadata = {}
+        columns: Dict[str, None] = {}
+        
+        for parquet_file in self.parquet_files:
+            try:
+                metadata = pq.read_metadata(parquet_file, memory_map=True)
+            except Exception as e:
+                logger.error(f"Error processing {parquet_file.name}: {str(e)}")
+                continue
+            
+            self._metadata[parquet_file] = metadata
+            for name in metadata.schema.to_arrow_schema().names:
+                columns.setdefault(name)
+        
+        self._columns = list(columns)
+        total_rows = sum(metadata.num_rows for metadata in self._metadata.values())
+        logger.info(f"Planned {total_rows} records in {len(self._columns)} columns")
+    
+    def _rows_per_batch(self, metadata: pq.FileMetaData) -> int:
+        """
+        Pick how many records to read from a parquet file at a time.
+        
+        Each batch may take its share of max_inflight_bytes across the batches in
+        flight, so files with large rows (such as embedded images) are read in
+        batches of fewer than batch_size records.
+        
+        Args:
+            metadata (pq.FileMetaData): Footer of the parquet file
+            
+        Returns:
+            int: Number of records per batch
+        """
+        # Row group sizes in the footer are uncompressed, close to the decoded size
+        total_bytes = sum(metadata.row_group(i).total_byte_size for i in range(metadata.num_row_groups))
+        if not metadata.num_rows or not total_bytes:
+            return self.batch_size
+        
+        row_bytes = total_bytes / metadata.num_rows
+        batch_bytes = self.max_inflight_bytes // (2 * self.max_workers)
+        return max(1, min(self.batch_size, int(batch_bytes // row_bytes)))
+    
+    def _iter_batches(self, parquet_file: Path) -> Iterator[pa.RecordBatch]:
+        """
+        Read a parquet file one record batch at a time.
+        
+        Args:
+            parquet_file (Path): Path to the parquet file
             
-            # Convert to list of dictionaries
-            records = []
-            for index, (_, row) in enumerate(df.iterrows()):
-                record = {}
+        Yields:
+            pa.RecordBatch: Up to batch_size records of the projected columns
+        """
+        try:
+            # Memory-map the file so column chunks are served from the page cache
+            # without an extra copy; only one batch is decoded at a time
+            metadata = self._metadata.get(parquet_file)
+            with pq.ParquetFile(parquet_file, metadata=metadata, memory_map=True, pre_buffer=True) as parquet:
+                columns = self._project_columns(parquet.schema_arrow)
+                logger.info(f"Processing {parquet_file.name}: {parquet.metadata.num_rows} records")
                 
-                for column, value in row.items():
-                    # Handle image fields specially
-                    if column == 'image':
-                        record[column] = self.process_image_field(value, index)
-                    else:
-                        # Convert other data types to string for CSV compatibility
-                        if pd.isna(value):
-                            record[column] = ""
-                        else:
-                            record[column] = str(value)
+                # Skip row groups that hold no records
+                row_groups = [
+                    i for i in range(parquet.metadata.num_row_groups)
+                    if parquet.metadata.row_group(i).num_rows
+                ]
+                if not row_groups:
+                    return
                 
-                records.append(record)
-            
-            return records
+                yield from parquet.iter_batches(
+                    batch_size=self._rows_per_batch(parquet.metadata), row_groups=row_groups,
+                    columns=columns, use_threads=True
+                )
             
         except Exception as e:
             logger.error(f"Error processing {parquet_file.name}: {str(e)}")
-            return []
+    
+    def _stringify_column(self, array: pa.Array) -> pa.Array:
+        """
+        Convert a column to strings for CSV compatibility, with nulls as "".
+        
+        Args:
+            array (pa.Array): Column of a record batch
+            
+        Returns:
+            pa.Array: String column
+        """
+        array_type = array.type
+        if (pa.types.is_string(array_type) or pa.types.is_large_string(array_type)
+                or pa.types.is_integer(array_type) or pa.types.is_date(array_type)
+                or pa.types.is_decimal(array_type)):
+            return pc.fill_null(pc.cast(array, pa.string()), "")
+        
+        if (pa.types.is_binary(array_type) or pa.types.is_large_binary(array_type)
+                or pa.types.is_fixed_size_binary(array_type)):
+            # Keep str(bytes), e.g. b'ab'; pandas would decode the bytes as UTF-8
+            # (and fail on anything else), depending on its version
+            return pa.array(["" if value is None else str(value) for value in array.to_pylist()],
+                            type=pa.string())
+        
+        # Arrow cannot cast nested values and formats floats, booleans and
+        # timestamps differently from Python, so convert those via pandas
+        values = array.to_pandas()
+        return pa.array(values.astype(str).where(values.notna(), ""), type=pa.string())
+    
+    def _convert_image_column(self, array: pa.Array, start_index: int) -> Union[pa.Array, List[Any]]:
+        """
+        Convert the image column of a record batch.
+        
+        When images are not saved, the metadata process_image_field would return
+        is computed for the whole column at once instead of boxing every value.
+        When they are, images are only hashed and encoded here; their file names
+        are assigned later by _finish_batch, in record order.
+        
+        Args:
+            array (pa.Array): Image column of a record batch
+            start_index (int): Dataset-wide index of the batch's first record
+            
+        Returns:
+            Union[pa.Array, List[Any]]: Image information, or the prepared images
+        """
+        if not self.save_images:
+            if pa.types.is_string(array.type) or pa.types.is_large_string(array.type):
+                return pc.fill_null(pc.cast(array, pa.string()), "No image")
+            return pc.if_else(pc.is_valid(array), "Image data present", "No image")
+        
+        # All values of a column share one type, so pick the handler once instead
+        # of letting process_image_field inspect every value
+        array_type = array.type
+        if pa.types.is_struct(array_type) and array_type.get_field_index('bytes') >= 0:
+            # HF image struct: take the bytes child (with the struct's nulls) and
+            # skip building a dict per record
+            values = array.flatten()[array_type.get_field_index('bytes')].to_pylist()
+            handler = self._prepare_image_bytes
+        elif (pa.types.is_binary(array_type) or pa.types.is_large_binary(array_type)
+                or pa.types.is_fixed_size_binary(array_type)):
+            values = array.to_pylist()
+            handler = self._prepare_image_bytes
+        else:
+            values = array.to_pylist()
+            handler = self._prepare_image
+        
+        return [handler(value, index) for index, value in enumerate(values, start_index)]
+    
+    def _prepare_batch(self, batch: pa.RecordBatch, start_index: int) -> Tuple[List[str], List[Any]]:
+        """
+        Convert a record batch to CSV-ready strings, except for the names of saved
+        images. This is the expensive part of the conversion and runs on the
+        thread pool.
+        
+        Args:
+            batch (pa.RecordBatch): Records read from a parquet file
+            start_index (int): Dataset-wide index of the batch's first record
+            
+        Returns:
+            Tuple[List[str], List[Any]]: Column names and converted columns; a
+            saved image column is still a list of prepared images
+        """
+        columns = []
+        for name, array in zip(batch.schema.names, batch.columns):
+            # Handle image fields specially
+            if name == 'image':
+                columns.append(self._convert_image_column(array, start_index))
+            else:
+                columns.append(self._stringify_column(array))
+        
+        return batch.schema.names, columns
+    
+    def _finish_batch(self, prepared: Tuple[List[str], List[Any]], start_index: int) -> pa.RecordBatch:
+        """
+        Name the saved images of a prepared batch and build the final record batch.
+        Batches must be finished in record order so image names do not depend on
+        which conversion thread ran first.
+        
+        Args:
+            prepared: Result of _prepare_batch
+            start_index (int): Dataset-wide index of the batch's first record,
+                used for unique image naming
+            
+        Returns:
+            pa.RecordBatch: Records with all values as strings
+        """
+        names, columns = prepared
+        columns = [
+            pa.array(
+                [self._resolve_image(value, index) for index, value in enumerate(column, start_index)],
+                type=pa.string()
+            ) if isinstance(column, list) else column
+            for column in columns
+        ]
+        return pa.RecordBatch.from_arrays(columns, names=names)
+    
+    def _convert_batch(self, batch: pa.RecordBatch, start_index: int) -> pa.RecordBatch:
+        """
+        Convert a record batch to CSV-ready strings.
+        
+        Args:
+            batch (pa.RecordBatch): Records read from a parquet file
+            start_index (int): Dataset-wide index of the batch's first record,
+                used for unique image naming
+            
+        Returns:
+            pa.RecordBatch: Records with all values as strings
+        """
+        return self._finish_batch(self._prepare_batch(batch, start_index), start_index)
+    
+    def extract_data_from_parquet(self, parquet_file: Path, start_index: int = 0) -> Iterator[pd.DataFrame]:
+        """
+        Extract data from a single parquet file, one record batch at a time.
+        
+        Args:
+            parquet_file (Path): Path to the parquet file
+            start_index (int): Dataset-wide index of the file's first record,
+                used for unique image naming
+            
+        Yields:
+            pd.DataFrame: Extracted records with all values as strings
+        """
+        for batch in self._iter_batches(parquet_file):
+            yield self._convert_batch(batch, start_index).to_pandas()
+            start_index += batch.num_rows
     
     def extract_all_data(self) -> None:
         """
-        Extract data from all parquet files and combine them.
+        Extract data from all parquet files and stream it to the output CSV file.
         """
         logger.info("Starting data extraction...")
         
         # Find all parquet files
         self.find_parquet_files()
         
-        # Process each parquet file with progress bar
-        for parquet_file in tqdm(self.parquet_files, desc="Processing parquet files"):
-            records = self.extract_data_from_parquet(parquet_file)
-            self.extracted_data.extend(records)
+        # Convert and write file by file
+        self.stream_to_csv()
         
-        logger.info(f"Total records extracted: {len(self.extracted_data)}")
+        logger.info(f"Total records extracted: {self._total_records}")
     
-    def save_to_csv(self) -> None:
+    def _iter_extracted_batches(self) -> Iterator[pa.RecordBatch]:
         """
-        Save extracted data to CSV file.
+        Read all parquet files batch by batch and yield the converted batches in order.
+        
+        Batches are converted on a thread pool while the next ones are read. At most
+        a couple of batches per worker, and about max_inflight_bytes of them, are
+        in flight at once, so memory use does not grow with file or dataset size
+        or with the number of workers. Saved images are named here, as batches
+        come back in order, which keeps the output deterministic.
+        
+        Yields:
+            pa.RecordBatch: Extracted records with all values as strings
         """
-        if not self.extracted_data:
-            logger.warning("No data to save!")
-            return
+        # Dataset-wide record index, used for unique image naming
+        record_index = 0
+        total_rows = sum(metadata.num_rows for metadata in self._metadata.values())
         
-        try:
-            # Convert to DataFrame
-            df = pd.DataFrame(self.extracted_data)
-            
-            # Save to CSV
-            df.to_csv(self.output_file, index=False, encoding='utf-8')
-            
-            logger.info(f"Data saved to {self.output_file}")
-            logger.info(f"CSV file contains {len(df)} rows and {len(df.columns)} columns")
-            
-            # Print column information
-            logger.info("Columns in the CSV file:")
-            for i, col in enumerate(df.columns, 1):
-                logger.info(f"  {i}. {col}")
+        # Files whose conversion failed; their remaining batches are skipped
+        failed: Set[Path] = set()
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor, \
+                tqdm(total=total_rows, unit=" records", desc="Processing parquet files") as progress:
+            pending = deque()
+            inflight_bytes = 0
+            for parquet_file in self._metadata:
+                for batch in self._iter_batches(parquet_file):
+                    if parquet_file in failed:
+                        break
+                    future = executor.submit(self._prepare_batch, batch, record_index)
+                    pending.append(_PendingBatch(parquet_file, record_index, future, batch.nbytes))
+                    inflight_bytes += batch.nbytes
+                    record_index += batch.num_rows
+                    progress.update(batch.num_rows)
+                    while pending and (len(pending) >= 2 * self.max_workers
+                                       or inflight_bytes > self.max_inflight_bytes):
+                        entry = pending.popleft()
+                        inflight_bytes -= entry.nbytes
+                        batch = self._collect_batch(entry, failed)
+                        if batch is not None:
+                            yield batch
+            while pending:
+                batch = self._collect_batch(pending.popleft(), failed)
+                if batch is not None:
+                    yield batch
+    
+    def _collect_batch(self, entry: _PendingBatch, failed: Set[Path]) -> Optional[pa.RecordBatch]:
+        """
+        Wait for a batch submitted to the conversion pool and finish it.
+        
+        A conversion error only skips the file it came from, as when every file
+        was converted as a whole: it is logged and the file is added to failed,
+        so its remaining batches are dropped.
+        
+        Args:
+            entry (_PendingBatch): Batch submitted to the conversion pool
+            failed (Set[Path]): Files whose conversion already failed
             
-            # Print sample data
-            logger.info("\nSample data (first 3 rows):")
-            print(df.head(3).to_string())
+        Returns:
+            Optional[pa.RecordBatch]: The finished batch, or None if it is skipped
+        """
+        parquet_file, start_index, future, _ = entry
+        if parquet_file in failed:
+            future.cancel()
+            return None
+        
+        try:
+            return self._finish_batch(future.result(), start_index)
+        except Exception as e:
+            logger.error(f"Error processing {parquet_file.name}: {str(e)}")
+            failed.add(parquet_file)
+            return None
+    
+    def _align_batch(self, batch: pa.RecordBatch) -> pa.RecordBatch:
+        """
+        Arrange a converted batch in CSV header order, filling columns its file
+        does not have with empty strings.
+        
+        Args:
+            batch (pa.RecordBatch): Converted records of one parquet file
             
+        Returns:
+            pa.RecordBatch: Records matching the planned CSV header
+        """
+        if batch.schema.names == self._columns:
+            return batch
+        
+        names = batch.schema.names
+        columns = [
+            batch.column(name) if name in names else pa.array([""] * batch.num_rows, type=pa.string())
+            for name in self._columns
+        ]
+        return pa.RecordBatch.from_arrays(columns, names=self._columns)
+    
+    def stream_to_csv(self) -> None:
+        """
+        Write extracted records to the CSV file as each record batch is converted.
+        """
+        self._total_records = 0
+        self._sample = None
+        self._nbytes = 0
+        self._output_size = 0
+        
+        # The footers fix the CSV header up front
+        self._plan()
+        
+        sink = None
+        writer = None
+        try:
+            for batch in self._iter_extracted_batches():
+                batch = self._align_batch(batch)
+                if writer is None:
+                    # Buffer output in 1 MiB chunks to keep the number of write syscalls low
+                    sink = pa.output_stream(self.output_file, buffer_size=1 << 20)
+                    writer = pa_csv.CSVWriter(
+                        sink,
+                        batch.schema,
+                        write_options=pa_csv.WriteOptions(include_header=True, batch_size=65536)
+                    )
+                    self._sample = batch.slice(0, 3).to_pandas()
+                
+                writer.write_batch(batch)
+                self._total_records += batch.num_rows
+                self._nbytes += batch.nbytes
+        
         except Exception as e:
             logger.error(f"Error saving to CSV: {str(e)}")
             raise
+        
+        finally:
+            if writer is not None:
+                writer.close()
+            if sink is not None:
+                sink.close()
+                self._output_size = os.path.getsize(self.output_file)
+            self.flush_images()
+    
+    def save_to_csv(self) -> None:
+        """
+        Report on the CSV file written during extraction.
+        """
+        if not self._total_records:
+            logger.warning("No data to save!")
+            return
+        
+        logger.info(f"Data saved to {self.output_file}")
+        logger.info(f"CSV file contains {self._total_records} rows and {len(self._columns)} columns")
+        
+        # Print column information
+        logger.info("Columns in the CSV file:")
+        for i, col in enumerate(self._columns, 1):
+            logger.info(f"  {i}. {col}")
+        
+        # Print sample data
+        logger.info("\nSample data (first 3 rows):")
+        print(self._sample.to_string())
     
     def get_dataset_info(self) -> Dict[str, Any]:
         """
@@ -261,17 +800,15 @@ class DatasetExtractor:
         Returns:
             Dict[str, Any]: Dataset information
         """
-        if not self.extracted_data:
+        if not self._total_records:
             return {"error": "No data extracted yet"}
         
-        df = pd.DataFrame(self.extracted_data)
-        
         info = {
-            "total_records": len(df),
-            "total_columns": len(df.columns),
-            "columns": list(df.columns),
-            "memory_usage": df.memory_usage(deep=True).sum(),
-            "file_size_mb": os.path.getsize(self.output_file) / (1024 * 1024) if os.path.exists(self.output_file) else 0
+            "total_records": self._total_records,
+            "total_columns": len(self._columns),
+            "columns": list(self._columns),
+            "memory_usage": self._nbytes,
+            "file_size_mb": self._output_size / (1024 * 1024)
         }
         
         return info
@@ -310,6 +847,24 @@ def main():
         default="images",
         help="Directory to save images (default: images)"
     )
+    parser.add_argument(
+        "--workers", 
+        type=int, 
+        default=None,
+        help="Number of record batches to convert in parallel (default: number of CPUs)"
+    )
+    parser.add_argument(
+        "--batch-size", 
+        type=int, 
+        default=32768,
+        help="Maximum number of records read from a parquet file at a time (default: 32768)"
+    )
+    parser.add_argument(
+        "--max-inflight-mb", 
+        type=int, 
+        default=32,
+        help="Approximate megabytes of record batches converted at once (default: 32)"
+    )
     
     args = parser.parse_args()
     
@@ -319,7 +874,10 @@ def main():
             data_directory=args.data_dir, 
             output_file=args.output,
             save_images=args.save_images,
-            images_dir=args.images_dir
+            images_dir=args.images_dir,
+            max_workers=args.workers,
+            batch_size=args.batch_size,
+            max_inflight_bytes=args.max_inflight_mb << 20
         )
         
         if args.info_only:
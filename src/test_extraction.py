@@ -3,7 +3,7 @@
 Test script to extract a small sample of data for demonstration
 """
 
-import pandas as pd
+import pyarrow.parquet as pq
 import glob
 from pathlib import Path
 import logging
@@ -30,29 +30,45 @@ def test_single_file():
     logger.info(f"Testing with file: {Path(first_file).name}")
     
     try:
-        # Read the first parquet file
-        df = pd.read_parquet(first_file)
-        logger.info(f"Successfully loaded {len(df)} records from {Path(first_file).name}")
+        # Open the first parquet file; record and column counts come from its footer
+        parquet_file = pq.ParquetFile(first_file)
+        columns = parquet_file.schema_arrow.names
+        num_rows = parquet_file.metadata.num_rows
+        logger.info(f"Successfully opened {Path(first_file).name} with {num_rows} records")
         
         # Show basic information
         print(f"\n📊 Dataset Information:")
-        print(f"   Records: {len(df):,}")
-        print(f"   Columns: {len(df.columns)}")
+        print(f"   Records: {num_rows:,}")
+        print(f"   Columns: {len(columns)}")
         print(f"   File size: {Path(first_file).stat().st_size / (1024*1024):.2f} MB")
         
         # Show column names
         print(f"\n📋 Columns:")
-        for i, col in enumerate(df.columns, 1):
+        for i, col in enumerate(columns, 1):
             print(f"   {i:2d}. {col}")
         
         # Show sample data (first 3 rows, excluding image data)
         print(f"\n📝 Sample Data (first 3 rows, excluding images):")
-        sample_cols = [col for col in df.columns if col != 'image']
-        sample_df = df[sample_cols].head(3)
         
-        for idx, row in sample_df.iterrows():
+        # Decode only the first 3 rows, reading just the leading row groups that hold
+        # them (normally only the first) instead of the whole file
+        row_groups, covered = [], 0
+        while covered < 3 and len(row_groups) < parquet_file.num_row_groups:
+            covered += parquet_file.metadata.row_group(len(row_groups)).num_rows
+            row_groups.append(len(row_groups))
+        first_batches = parquet_file.iter_batches(batch_size=3, row_groups=row_groups)
+        head_batch = next(first_batches, parquet_file.schema_arrow.empty_table())
+        
+        # Free Arrow buffers as columns convert and skip block consolidation;
+        # head_batch must not be used after this
+        head_df = head_batch.to_pandas(self_destruct=True, split_blocks=True)
+        del head_batch
+        sample_cols = [col for col in columns if col != 'image']
+        sample_df = head_df[sample_cols]
+        
+        for idx, values in enumerate(sample_df.itertuples(index=False, name=None)):
             print(f"\n   Row {idx + 1}:")
-            for col, value in row.items():
+            for col, value in zip(sample_cols, values):
                 # Truncate long values
                 value_str = str(value)
                 if len(value_str) > 100:
@@ -60,9 +76,9 @@ def test_single_file():
                 print(f"     {col}: {value_str}")
         
         # Test image processing
-        if 'image' in df.columns:
+        if 'image' in columns:
             print(f"\n🖼️  Image Data Sample:")
-            for idx, img_data in enumerate(df['image'].head(3)):
+            for idx, img_data in enumerate(head_df['image']):
                 if img_data is not None:
                     if hasattr(img_data, 'size'):
                         print(f"   Row {idx + 1}: Image available (size: {img_data.size})")
@@ -77,10 +93,10 @@ def test_single_file():
         logger.info(f"Sample data saved to {sample_output}")
         
         # Test image saving functionality
-        test_image_saving(df.head(3))
+        test_image_saving(head_df)
         
         # Save sample images locally for demonstration
-        save_sample_images(df.head(3))
+        save_sample_images(head_df)
         
         print(f"\n✅ Test completed successfully!")
         print(f"   Sample CSV created: {sample_output}")
@@ -123,11 +139,12 @@ def test_image_saving(sample_df):
             print(f"   📁 Test images directory: {test_images_dir}")
             
             # Test processing a few images
+            images = sample_df['image'].tolist() if 'image' in sample_df.columns else []
             images_saved = 0
-            for idx, (_, row) in enumerate(sample_df.iterrows()):
-                if 'image' in row and row['image'] is not None:
+            for idx, image in enumerate(images):
+                if image is not None:
                     try:
-                        result = extractor.process_image_field(row['image'], idx)
+                        result = extractor.process_image_field(image, idx)
                         if result and result != "No image" and not result.startswith("Error"):
                             images_saved += 1
                             print(f"   ✅ Row {idx + 1}: Image saved as {Path(result).name}")
@@ -136,6 +153,9 @@ def test_image_saving(sample_df):
                     except Exception as e:
                         print(f"   ❌ Row {idx + 1}: Error processing image - {str(e)}")
             
+            # Wait for queued image writes
+            extractor.flush_images()
+            
             # Check results
             if test_images_dir.exists():
                 saved_files = list(test_images_dir.glob("*.png"))
@@ -158,9 +178,9 @@ def test_image_saving(sample_df):
                 save_images=False
             )
             
-            for idx, (_, row) in enumerate(sample_df.iterrows()):
-                if 'image' in row and row['image'] is not None:
-                    result = extractor_no_save.process_image_field(row['image'], idx)
+            for idx, image in enumerate(images):
+                if image is not None:
+                    result = extractor_no_save.process_image_field(image, idx)
                     print(f"   📝 Row {idx + 1}: {result}")
                     break  # Just test one to show the difference
             
@@ -197,33 +217,41 @@ def save_sample_images(sample_df):
         
         print(f"   📁 Sample images directory: {sample_images_dir.absolute()}")
         
-        # Process and save images
+        # Process and save images, keeping each row's result for the CSV below
+        images = sample_df['image'].tolist() if 'image' in sample_df.columns else []
         images_saved = 0
         image_paths = []
+        image_results = []
         
-        for idx, (_, row) in enumerate(sample_df.iterrows()):
-            if 'image' in row and row['image'] is not None:
-                try:
-                    result = extractor.process_image_field(row['image'], idx)
-                    if result and result != "No image" and not result.startswith("Error"):
-                        images_saved += 1
-                        image_paths.append(result)
-                        print(f"   ✅ Row {idx + 1}: Image saved as {Path(result).name}")
-                    else:
-                        print(f"   ⚠️  Row {idx + 1}: {result}")
-                except Exception as e:
-                    print(f"   ❌ Row {idx + 1}: Error processing image - {str(e)}")
+        for idx, image in enumerate(images):
+            if image is None:
+                image_results.append("No image")
+                continue
+            try:
+                result = extractor.process_image_field(image, idx)
+                image_results.append(result)
+                if result and result != "No image" and not result.startswith("Error"):
+                    images_saved += 1
+                    image_paths.append(result)
+                    print(f"   ✅ Row {idx + 1}: Image saved as {Path(result).name}")
+                else:
+                    print(f"   ⚠️  Row {idx + 1}: {result}")
+            except Exception as e:
+                image_results.append(f"Error processing image: {str(e)}")
+                print(f"   ❌ Row {idx + 1}: Error processing image - {str(e)}")
         
-        # Create a CSV with image paths
+        # Create a CSV with image paths, reusing the results from above
         if image_paths:
             sample_with_images_df = sample_df.copy()
-            sample_with_images_df['image'] = [extractor.process_image_field(row['image'], idx) if 'image' in row and row['image'] is not None else "No image" 
-                                            for idx, (_, row) in enumerate(sample_df.iterrows())]
+            sample_with_images_df['image'] = image_results
             
             sample_with_images_output = "sample_extraction_with_images.csv"
             sample_with_images_df.to_csv(sample_with_images_output, index=False, encoding='utf-8')
             print(f"   📄 Sample CSV with image paths saved: {sample_with_images_output}")
         
+        # Wait for queued image writes
+        extractor.flush_images()
+        
         # Show summary
         if sample_images_dir.exists():
             saved_files = list(sample_images_dir.glob("*.png"))
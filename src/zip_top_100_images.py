@@ -6,9 +6,42 @@ This script efficiently handles large image directories by processing files in b
 
 import os
 import zipfile
-import glob
 from pathlib import Path
 import time
+from operator import attrgetter
+try:
+    from ._image_scan import iter_image_data, iter_image_entries
+except ImportError:
+    # Run as a script from src/, outside the package
+    from _image_scan import iter_image_data, iter_image_entries
+
+# Minimum number of seconds between progress lines
+PROGRESS_INTERVAL = 0.5
+
+# Disk preallocation is only available on some POSIX systems
+HAS_FALLOCATE = hasattr(os, 'posix_fallocate')
+
+# Rough bytes per zip entry for its local header, central directory record and name
+ZIP_ENTRY_OVERHEAD = 128
+
+def open_preallocated(path, size):
+    """
+    Open a file for binary writing with size bytes reserved on disk up front, so
+    the filesystem can lay it out in a few extents instead of growing it write by
+    write. The caller should truncate the file to the written length when done.
+    
+    Args:
+        path (str): Path of the file to create
+        size (int): Number of bytes to reserve
+    """
+    f = open(path, 'wb')
+    if HAS_FALLOCATE and size > 0:
+        try:
+            os.posix_fallocate(f.fileno(), 0, size)
+        except OSError:
+            # Preallocation is best effort; some filesystems do not support it
+            pass
+    return f
 
 def zip_top_100_images(images_dir="images", output_zip="top_100_images.zip", num_images=100):
     """
@@ -28,53 +61,60 @@ def zip_top_100_images(images_dir="images", output_zip="top_100_images.zip", num
     try:
         print(f"Scanning for images in '{images_dir}'...")
         
-        # Common image extensions
-        image_extensions = ['*.jpg', '*.jpeg', '*.png', '*.gif', '*.bmp', '*.tiff', '*.webp']
-        
-        # Get all image files
-        image_files = []
-        for ext in image_extensions:
-            pattern = os.path.join(images_dir, ext)
-            image_files.extend(glob.glob(pattern))
-            # Also check for uppercase extensions
-            pattern_upper = os.path.join(images_dir, ext.upper())
-            image_files.extend(glob.glob(pattern_upper))
+        # Scan the directory once, keeping only the first num_images paths in
+        # sorted order instead of a list of the whole directory
+        by_path = attrgetter('path')
+        selected_entries = []
+        found = 0
+        for entry in iter_image_entries(images_dir):
+            found += 1
+            selected_entries.append(entry)
+            if len(selected_entries) > 2 * num_images:
+                selected_entries = sorted(selected_entries, key=by_path)[:num_images]
+        selected_entries = sorted(selected_entries, key=by_path)[:num_images]
         
-        # Remove duplicates and sort
-        image_files = sorted(list(set(image_files)))
+        # Stat only the selected files, once each; the zip entries reuse the result
+        selected_images = [(entry.path, entry.stat()) for entry in selected_entries]
         
-        print(f"Found {len(image_files)} image files")
+        print(f"Found {found} image files")
         
-        if len(image_files) == 0:
+        if found == 0:
             print("No image files found in the directory!")
             return False
         
-        # Take only the first num_images
-        selected_images = image_files[:num_images]
-        
         print(f"Selected top {len(selected_images)} images for zipping...")
         
         # Create zip file
         print(f"Creating zip file: {output_zip}")
         start_time = time.time()
+        total_original_size = 0
+        last_progress = time.monotonic()
+        
+        # Reserve the archive's space from the cached sizes; images are mostly
+        # stored as-is, so this is close to the final size
+        estimated_size = sum(st.st_size + ZIP_ENTRY_OVERHEAD for _, st in selected_images)
         
-        with zipfile.ZipFile(output_zip, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            for i, image_path in enumerate(selected_images, 1):
-                # Get relative path for the zip file
-                arcname = os.path.basename(image_path)
-                
-                # Add file to zip
-                zipf.write(image_path, arcname)
-                
-                # Progress indicator
-                if i % 10 == 0 or i == len(selected_images):
-                    print(f"Processed {i}/{len(selected_images)} images...")
+        with open_preallocated(output_zip, estimated_size) as out:
+            with zipfile.ZipFile(out, 'w') as zipf:
+                for i, (zinfo, data) in enumerate(iter_image_data(selected_images), 1):
+                    # Add file to zip; its bytes were read ahead on the thread pool
+                    zipf.writestr(zinfo, data)
+                    total_original_size += len(data)
+                    
+                    # Progress indicator, limited in time so large runs are not
+                    # slowed down by printing
+                    now = time.monotonic()
+                    if now - last_progress >= PROGRESS_INTERVAL or i == len(selected_images):
+                        print(f"Processed {i}/{len(selected_images)} images...")
+                        last_progress = now
+            
+            # Drop whatever reserved space the archive did not use
+            out.truncate()
         
         end_time = time.time()
         processing_time = end_time - start_time
         
-        # Get file sizes for comparison
-        total_original_size = sum(os.path.getsize(img) for img in selected_images)
+        # Get zip file size
         zip_size = os.path.getsize(output_zip)
         
         print(f"\nSummary:")
@@ -6,9 +6,16 @@ This version processes images one by one without loading all file paths into mem
 
 import os
 import zipfile
-import glob
 from pathlib import Path
 import time
+try:
+    from ._image_scan import iter_image_data, iter_image_entries
+except ImportError:
+    # Run as a script from src/, outside the package
+    from _image_scan import iter_image_data, iter_image_entries
+
+# Minimum number of seconds between progress lines
+PROGRESS_INTERVAL = 0.5
 
 def zip_top_100_images_efficient(images_dir="images", output_zip="top_100_images.zip", num_images=100):
     """
@@ -29,65 +36,30 @@ def zip_top_100_images_efficient(images_dir="images", output_zip="top_100_images
     try:
         print(f"Scanning for images in '{images_dir}'...")
         
-        # Common image extensions
-        image_extensions = ['*.jpg', '*.jpeg', '*.png', '*.gif', '*.bmp', '*.tiff', '*.webp']
-        
         # Create zip file
         print(f"Creating zip file: {output_zip}")
         start_time = time.time()
         
         images_processed = 0
         total_original_size = 0
+        last_progress = time.monotonic()
         
-        with zipfile.ZipFile(output_zip, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            for ext in image_extensions:
-                if images_processed >= num_images:
-                    break
-                    
-                # Process lowercase extension
-                pattern = os.path.join(images_dir, ext)
-                for image_path in glob.iglob(pattern):
-                    if images_processed >= num_images:
-                        break
-                    
-                    # Get relative path for the zip file
-                    arcname = os.path.basename(image_path)
-                    
-                    # Add file to zip
-                    zipf.write(image_path, arcname)
-                    
-                    # Track statistics
-                    file_size = os.path.getsize(image_path)
-                    total_original_size += file_size
-                    images_processed += 1
-                    
-                    # Progress indicator
-                    if images_processed % 10 == 0 or images_processed == num_images:
-                        print(f"Processed {images_processed}/{num_images} images...")
+        with zipfile.ZipFile(output_zip, 'w') as zipf:
+            images = ((entry.path, entry.stat()) for entry in iter_image_entries(images_dir, num_images))
+            for zinfo, data in iter_image_data(images):
+                # Add file to zip; its bytes were read ahead on the thread pool
+                zipf.writestr(zinfo, data)
+                
+                # Track statistics
+                total_original_size += len(data)
+                images_processed += 1
                 
-                # Process uppercase extension
-                if images_processed >= num_images:
-                    break
-                    
-                pattern_upper = os.path.join(images_dir, ext.upper())
-                for image_path in glob.iglob(pattern_upper):
-                    if images_processed >= num_images:
-                        break
-                    
-                    # Get relative path for the zip file
-                    arcname = os.path.basename(image_path)
-                    
-                    # Add file to zip
-                    zipf.write(image_path, arcname)
-                    
-                    # Track statistics
-                    file_size = os.path.getsize(image_path)
-                    total_original_size += file_size
-                    images_processed += 1
-                    
-                    # Progress indicator
-                    if images_processed % 10 == 0 or images_processed == num_images:
-                        print(f"Processed {images_processed}/{num_images} images...")
+                # Progress indicator, limited in time so large runs are not
+                # slowed down by printing
+                now = time.monotonic()
+                if now - last_progress >= PROGRESS_INTERVAL or images_processed == num_images:
+                    print(f"Processed {images_processed}/{num_images} images...")
+                    last_progress = now
         
         end_time = time.time()
         processing_time = end_time - start_time
@@ -1,13 +1,21 @@
 #!/usr/bin/env python3
 """
 Script to extract the top 100 rows from extracted_dataset.csv and create a zip file.
-This script efficiently handles large CSV files by reading only the required rows.
+This script efficiently handles large CSV files by copying only the required rows
+straight into the zip file, without parsing them or writing a temporary file.
+Because rows are copied as raw bytes, the zipped CSV is byte-for-byte identical to
+the top of the input; running it through a CSV parser such as pandas or polars would
+only add work and could change quoting or number formatting.
 """
 
-import pandas as pd
 import zipfile
 import os
 from pathlib import Path
+try:
+    from .zip_top_100_rows_lite import copy_rows_raw
+except ImportError:
+    # Run as a script from src/, outside the package
+    from zip_top_100_rows_lite import copy_rows_raw
 
 def zip_top_100_rows(input_file="extracted_dataset.csv", output_zip="top_100_rows.zip", num_rows=100):
     """
@@ -27,26 +35,14 @@ def zip_top_100_rows(input_file="extracted_dataset.csv", output_zip="top_100_row
     try:
         print(f"Reading top {num_rows} rows from '{input_file}'...")
         
-        # Read only the first num_rows + 1 (to include header)
-        df = pd.read_csv(input_file, nrows=num_rows)
-        
-        print(f"Successfully read {len(df)} rows (including header)")
-        print(f"Columns: {list(df.columns)}")
-        
-        # Create a temporary CSV file with the top rows
-        temp_csv = "temp_top_100_rows.csv"
-        df.to_csv(temp_csv, index=False)
-        
-        print(f"Created temporary CSV file: {temp_csv}")
-        
-        # Create zip file
+        # Create zip file and stream the header plus num_rows records into it
         print(f"Creating zip file: {output_zip}")
-        with zipfile.ZipFile(output_zip, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            zipf.write(temp_csv, os.path.basename(temp_csv))
+        with zipfile.ZipFile(output_zip, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as zipf:
+            with zipf.open("temp_top_100_rows.csv", 'w') as outfile:
+                columns, rows_written = copy_rows_raw(input_file, outfile, num_rows)
         
-        # Clean up temporary file
-        os.remove(temp_csv)
-        print(f"Cleaned up temporary file: {temp_csv}")
+        print(f"Successfully read {rows_written} rows (plus header)")
+        print(f"Columns: {columns}")
         
         # Get file sizes for comparison
         original_size = os.path.getsize(input_file)
@@ -2,14 +2,82 @@
 """
 Lightweight script to extract the top 100 rows from extracted_dataset.csv and create a zip file.
 This version uses only standard library modules for maximum compatibility and minimal memory usage.
+
+By default rows are copied as raw bytes without being parsed; only the quotes are
+counted, so records whose quoted fields contain newlines are still copied whole.
+Run with --safe to re-serialise the rows through the csv module instead.
 """
 
+import argparse
 import csv
+import io
+import itertools
 import zipfile
 import os
 from pathlib import Path
 
-def zip_top_100_rows_lite(input_file="extracted_dataset.csv", output_zip="top_100_rows.zip", num_rows=100):
+def copy_rows_raw(input_file, outfile, num_rows):
+    """
+    Copy the header and the next num_rows records into a binary stream as raw bytes.
+    
+    Args:
+        input_file (str): Path to the input CSV file
+        outfile: Binary file object to write to
+        num_rows (int): Number of data rows to copy
+        
+    Returns:
+        tuple: (header columns, number of data rows written)
+    """
+    header = b""
+    records = 0
+    with open(input_file, 'rb') as infile:
+        quotes = 0
+        for line in infile:
+            outfile.write(line)
+            if records == 0:
+                header += line
+            
+            # A quoted field may span lines; a record only ends once
+            # its quotes are balanced
+            quotes += line.count(b'"')
+            if quotes % 2 == 0:
+                records += 1
+                if records > num_rows:
+                    break
+    
+    columns = next(csv.reader([header.decode('utf-8')]), [])
+    return columns, max(records - 1, 0)
+
+def copy_rows_csv(input_file, outfile, num_rows):
+    """
+    Copy the header and the next num_rows records into a binary stream using the
+    csv module, so quoted fields may contain newlines.
+    
+    Args:
+        input_file (str): Path to the input CSV file
+        outfile: Binary file object to write to
+        num_rows (int): Number of data rows to copy
+        
+    Returns:
+        tuple: (header columns, number of data rows written)
+    """
+    with open(input_file, 'r', encoding='utf-8', newline='') as infile, \
+            io.TextIOWrapper(outfile, encoding='utf-8', newline='') as text_out:
+        reader = csv.reader(infile)
+        writer = csv.writer(text_out)
+        
+        # Read and write header
+        header = next(reader)
+        writer.writerow(header)
+        
+        # Read and write the specified number of data rows in one call
+        rows = list(itertools.islice(reader, num_rows))
+        writer.writerows(rows)
+    
+    return header, len(rows)
+
+def zip_top_100_rows_lite(input_file="extracted_dataset.csv", output_zip="top_100_rows.zip", num_rows=100,
+                          safe=False):
     """
     Extract the top N rows from a CSV file and create a zip file using only standard library.
     
@@ -17,6 +85,7 @@ def zip_top_100_rows_lite(input_file="extracted_dataset.csv", output_zip="top_10
         input_file (str): Path to the input CSV file
         output_zip (str): Path to the output zip file
         num_rows (int): Number of rows to extract from the top
+        safe (bool): Re-serialise rows through the csv module instead of copying raw bytes
     """
     
     # Check if input file exists
@@ -27,39 +96,16 @@ def zip_top_100_rows_lite(input_file="extracted_dataset.csv", output_zip="top_10
     try:
         print(f"Reading top {num_rows} rows from '{input_file}'...")
         
-        # Create a temporary CSV file with the top rows
-        temp_csv = "temp_top_100_rows.csv"
-        
-        with open(input_file, 'r', encoding='utf-8', newline='') as infile:
-            with open(temp_csv, 'w', encoding='utf-8', newline='') as outfile:
-                reader = csv.reader(infile)
-                writer = csv.writer(outfile)
-                
-                # Read and write header
-                header = next(reader)
-                writer.writerow(header)
-                print(f"Header columns: {len(header)}")
-                
-                # Read and write the specified number of data rows
-                rows_written = 0
-                for row in reader:
-                    if rows_written >= num_rows:
-                        break
-                    writer.writerow(row)
-                    rows_written += 1
-                
-                print(f"Successfully read {rows_written} data rows")
-        
-        print(f"Created temporary CSV file: {temp_csv}")
-        
-        # Create zip file
+        # Create zip file and write the top rows straight into it; the fastest
+        # deflate level is almost as small for a payload this size
         print(f"Creating zip file: {output_zip}")
-        with zipfile.ZipFile(output_zip, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            zipf.write(temp_csv, os.path.basename(temp_csv))
+        copy_rows = copy_rows_csv if safe else copy_rows_raw
+        with zipfile.ZipFile(output_zip, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as zipf:
+            with zipf.open("temp_top_100_rows.csv", 'w') as outfile:
+                header, rows_written = copy_rows(input_file, outfile, num_rows)
         
-        # Clean up temporary file
-        os.remove(temp_csv)
-        print(f"Cleaned up temporary file: {temp_csv}")
+        print(f"Header columns: {len(header)}")
+        print(f"Successfully read {rows_written} data rows")
         
         # Get file sizes for comparison
         original_size = os.path.getsize(input_file)
@@ -80,6 +126,11 @@ def zip_top_100_rows_lite(input_file="extracted_dataset.csv", output_zip="top_10
 def main():
     """Main function to run the script."""
     
+    parser = argparse.ArgumentParser(description="Zip the top rows of a CSV file")
+    parser.add_argument("--safe", action="store_true",
+                        help="Re-serialise rows through the csv module instead of copying raw bytes")
+    args = parser.parse_args()
+    
     # Configuration
     input_file = "extracted_dataset.csv"
     output_zip = "top_100_rows.zip"
@@ -91,10 +142,11 @@ def main():
     print(f"Input file: {input_file}")
     print(f"Output zip: {output_zip}")
     print(f"Number of rows to extract: {num_rows}")
+    print(f"Mode: {'csv parser (safe)' if args.safe else 'raw copy'}")
     print("=" * 60)
     
     # Run the extraction and zipping process
-    success = zip_top_100_rows_lite(input_file, output_zip, num_rows)
+    success = zip_top_100_rows_lite(input_file, output_zip, num_rows, safe=args.safe)
     
     if success:
         print("\n✅ Process completed successfully!")